@@ -3,14 +3,23 @@
 Este é um aplicativo Streamlit interativo para analisar dados da Dívida Pública
 e dos Gastos Públicos Federais.
 
-Os dados são lidos de arquivos JSON locais para garantir 100% de estabilidade
-durante a apresentação, contornando a instabilidade das APIs oficiais.
+Os dados vêm de snapshots embutidos no módulo `dados.py` (gerado a partir dos
+arquivos JSON pelo script `gerar_snapshot.py`) para garantir 100% de
+estabilidade durante a apresentação, contornando a instabilidade das APIs oficiais.
 """
 
+import html
+import inspect
+import json
+import re
+
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-import matplotlib.pyplot as plt
-import json
+import numpy as np
+import altair as alt
+
+import dados
 
 # Configuração da página
 st.set_page_config(
@@ -22,186 +31,323 @@ st.set_page_config(
 # --- Funções de Carregamento de Dados (com cache) ---
 # Usar o cache do Streamlit é crucial para performance.
 
-@st.cache_data
-def carregar_dados_json(caminho_arquivo):
-    """Lê um arquivo JSON local e retorna os dados."""
-    try:
-        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        st.error(f"Erro: O arquivo {caminho_arquivo} não foi encontrado. Certifique-se de que ele está na mesma pasta do app.")
-        return None
-    except Exception as e:
-        st.error(f"Erro ao ler o arquivo {caminho_arquivo}: {e}")
-        return None
+# id(DataFrame) -> nome fixo, preenchido logo após `carregar_dataframes()`.
+# Os dados são um snapshot fixo, então o nome basta como chave de cache e o
+# Streamlit não precisa percorrer todas as linhas/colunas a cada chamada.
+CHAVES_DATAFRAMES = {}
+
+def _hash_dataframe(df):
+    """Chave de cache estável para DataFrames pequenos e imutáveis."""
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes()
+
+def _chave_dataframe(df):
+    """Chave de cache O(1) para os DataFrames da sessão (ou o hash do conteúdo)."""
+    chave = CHAVES_DATAFRAMES.get(id(df))
+    return chave if chave is not None else _hash_dataframe(df)
 
 @st.cache_data
 def carregar_dataframes():
-    """Carrega todos os arquivos JSON e os converte em DataFrames pandas."""
-    dados_evolucao = carregar_dados_json('dados_evolucao_divida.json')
-    dados_detentores = carregar_dados_json('dados_detentores_divida.json')
-    dados_gastos = carregar_dados_json('dados_gastos_comparativo.json')
-
-    if dados_evolucao and dados_detentores and dados_gastos:
-        df_evolucao = pd.DataFrame(dados_evolucao).set_index('ano')
-        df_detentores = pd.DataFrame(dados_detentores)
-        df_gastos = pd.DataFrame(dados_gastos)
-        return df_evolucao, df_detentores, df_gastos
+    """Retorna os snapshots de `dados.py` e os DataFrames derivados deles."""
+    # Colunas de texto repetidas viram `category`: o pandas compara códigos
+    # inteiros em vez de strings (menos memória, filtros e pivot mais rápidos)
+    df_detentores = dados.DETENTORES.astype({'credor': 'category'})
+    df_gastos = dados.GASTOS.astype({'funcao': 'category'})
+    
+    # Pivotar os gastos (anos como colunas), ordenados pela maior despesa em 2024.
+    # Feito uma única vez aqui, pois é usado pelo gráfico e pela tabela da aba 2.
+    df_gastos_pivot = df_gastos.pivot(index='funcao', columns='ano', values='valor_bi')
+    df_gastos_pivot = df_gastos_pivot.sort_values(2024, ascending=False)
+    return dados.EVOLUCAO, df_detentores, df_gastos, df_gastos_pivot
+
+@st.cache_data(hash_funcs={pd.DataFrame: _chave_dataframe})
+def precalcular_gastos(df_gastos):
+    """Retorna {ano: [registro, ...]} com os gastos e a porcentagem, do maior para o menor."""
+    anos = df_gastos['ano'].to_numpy()
+    valores = df_gastos['valor_bi'].to_numpy()
+    funcoes = df_gastos['funcao'].to_numpy()
     
-    return None, None, None
+    gastos_por_ano = {}
+    for ano in np.unique(anos):
+        mascara = anos == ano
+        valores_ano, funcoes_ano = valores[mascara], funcoes[mascara]
+        porcentagens = valores_ano / valores_ano.sum() * 100
+        ordem = np.argsort(-porcentagens, kind='stable')
+        gastos_por_ano[int(ano)] = [
+            {'funcao': funcoes_ano[i], 'valor_bi': valores_ano[i], 'porcentagem': porcentagens[i]}
+            for i in ordem
+        ]
+    return gastos_por_ano
 
 # --- Funções dos Gráficos ---
+# Os gráficos são especificações Altair/Vega-Lite: o navegador desenha tudo,
+# sem rasterizar PNGs no servidor. Ficam em cache (`st.cache_resource`) porque
+# os dados são fixos e não há motivo para remontá-los a cada rerun.
 
+@st.cache_resource(hash_funcs={pd.DataFrame: _chave_dataframe})
 def criar_grafico_evolucao(df):
     """Cria um gráfico de linha da evolução da dívida."""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(df.index, df['valor_trilhoes'], marker='o', linestyle='-', color='#0072B2')
-    
-    ax.set_title('Evolução do Estoque da Dívida Pública Federal', fontsize=16)
-    ax.set_xlabel('Ano', fontsize=12)
-    ax.set_ylabel('Valor (em Trilhões de R$)', fontsize=12)
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
+    linha = alt.Chart().mark_line(point=True, color='#0072B2')
     
     # Adiciona os rótulos de valor em cada ponto
-    for ano, valor in df['valor_trilhoes'].items():
-        ax.text(ano, valor + 0.1, f'R$ {valor:.2f}T', ha='center', fontsize=10)
-        
-    return fig
+    rotulos = alt.Chart().mark_text(dy=-12, fontSize=10).encode(text='rotulo:N')
+    
+    # Dados, eixos e o cálculo do rótulo ficam no nível da camada, e não
+    # repetidos em cada camada: a especificação enviada ao navegador fica menor
+    return alt.layer(linha, rotulos, data=df.reset_index()).encode(
+        x=alt.X('ano:O', title='Ano', axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('valor_trilhoes:Q', title='Valor (em Trilhões de R$)')
+    ).transform_calculate(
+        rotulo="'R$ ' + format(datum.valor_trilhoes, '.2f') + 'T'"
+    ).properties(
+        title=alt.Title('Evolução do Estoque da Dívida Pública Federal', fontSize=16),
+        height=400
+    )
 
+@st.cache_resource(hash_funcs={pd.DataFrame: _chave_dataframe})
 def criar_grafico_detentores(df):
-    """Cria um gráfico de pizza dos detentores da dívida."""
-    df = df.set_index('credor')
-    
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    wedges, texts, autotexts = ax.pie(
-        df['porcentagem'], 
-        autopct='%1.1f%%', 
-        startangle=90,
-        pctdistance=0.85,
-        colors=plt.cm.Paired.colors
+    """Cria um gráfico de rosca ("donut chart") dos detentores da dívida."""
+    # Rosca desenhada direto pelo `innerRadius` (sem círculo branco por cima);
+    # legenda no formato "Credor - 25.5%", na ordem do maior para o menor
+    fatias = alt.Chart().mark_arc(innerRadius=70, outerRadius=150, stroke='white').encode(
+        color=alt.Color(
+            'legenda:N',
+            title='Credores',
+            sort=alt.EncodingSortField('porcentagem', order='descending'),
+            scale=alt.Scale(scheme='paired')
+        )
     )
-    
-    # Círculo no centro para fazer um "donut chart"
-    centre_circle = plt.Circle((0,0),0.70,fc='white')
-    fig.gca().add_artist(centre_circle)
-    
-    ax.set_title('Detentores da Dívida Pública (Foto Recente)', fontsize=16)
-    
-    # Criar a legenda com base nos dados do DataFrame
-    legend_labels = [f'{i} - {p:.1f}%' for i, p in zip(df.index, df['porcentagem'])]
-    ax.legend(
-        legend_labels,
-        title="Credores",
-        loc="center left",
-        bbox_to_anchor=(1, 0, 0.5, 1),
-        fontsize=10
+    porcentagens = alt.Chart().mark_text(radius=130, fontSize=10, fontWeight='bold', color='black').encode(
+        text='rotulo:N'
     )
     
-    plt.setp(autotexts, size=10, weight="bold", color="black")
-    ax.axis('equal')  # Equal aspect ratio
-    return fig
+    # Só as colunas usadas vão para o navegador (a `descricao` fica de fora)
+    return alt.layer(fatias, porcentagens, data=df[['credor', 'porcentagem']]).encode(
+        theta=alt.Theta('porcentagem:Q', stack=True),
+        order=alt.Order('porcentagem:Q', sort='descending')
+    ).transform_calculate(
+        legenda="datum.credor + ' - ' + format(datum.porcentagem, '.1f') + '%'",
+        rotulo="format(datum.porcentagem, '.1f') + '%'"
+    ).properties(
+        title=alt.Title('Detentores da Dívida Pública (Foto Recente)', fontSize=16),
+        height=400
+    )
 
-def criar_grafico_gastos_comparativo(df):
-    """Cria um gráfico de barras comparativo (2018 vs 2024)."""
-    
-    # Pivotar os dados para ter anos como colunas
-    df_pivot = df.pivot(index='funcao', columns='ano', values='valor_bi')
-    
-    # Ordenar pela maior despesa em 2024 para um gráfico mais limpo
-    df_pivot = df_pivot.sort_values(2024, ascending=False)
-    
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    df_pivot.plot(kind='bar', ax=ax, width=0.8)
-    
-    ax.set_title('Comparativo de Gastos por Função (2018 vs 2024)', fontsize=16)
-    ax.set_xlabel('Função Orçamentária', fontsize=12)
-    ax.set_ylabel('Valor (em Bilhões de R$)', fontsize=12)
-    ax.legend(title='Ano', loc='upper right')
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    plt.xticks(rotation=45, ha='right')
+@st.cache_resource(hash_funcs={pd.DataFrame: _chave_dataframe})
+def criar_grafico_gastos_comparativo(df_pivot):
+    """Cria um gráfico de barras comparativo (2018 vs 2024).
+
+    Recebe os gastos já pivotados e ordenados por `carregar_dataframes`.
+    """
+    df = df_pivot.reset_index().melt(id_vars='funcao', var_name='ano', value_name='valor_bi')
     
-    return fig
+    return alt.Chart(df).mark_bar().encode(
+        x=alt.X('funcao:N', title='Função Orçamentária', sort=df_pivot.index.tolist(), axis=alt.Axis(labelAngle=-45)),
+        xOffset='ano:N',
+        y=alt.Y('valor_bi:Q', title='Valor (em Bilhões de R$)'),
+        color=alt.Color('ano:N', title='Ano'),
+        tooltip=['funcao:N', 'ano:N', 'valor_bi:Q']
+    ).properties(
+        title=alt.Title('Comparativo de Gastos por Função (2018 vs 2024)', fontSize=16),
+        height=450
+    )
 
 # --- Função de Análise Interativa (ATUALIZADA) ---
 
-def responder_pergunta(pergunta, df_evolucao, df_detentores, df_gastos):
-    """Processa a pergunta selecionada e retorna a resposta."""
+# Modelos das linhas das listagens, preenchidos com `str.format_map`
+MODELO_LINHA_GASTO = "- **{funcao}**: R$ {valor_bi:.1f} bi ({porcentagem:.1f}% do total listado)"
+MODELO_LINHA_CREDOR = "- **{credor}**: {porcentagem:.1f}%"
+
+def _formatar_linhas(registros, modelo):
+    """Retorna as linhas em Markdown de uma listagem (uma linha por registro)."""
+    return "\n".join(modelo.format_map(registro) for registro in registros)
+
+def _gasto_extremo(anos, valores, funcoes, ano, maior=True):
+    """Retorna (função, valor_bi) do maior (ou menor) gasto de um ano."""
+    mascara = anos == ano
+    # Sem este teste, argmax/argmin devolveriam a linha 0 (de outro ano)
+    if not mascara.any():
+        raise ValueError(f"não há gastos de {ano} nos dados")
+    if maior:
+        i = np.argmax(np.where(mascara, valores, -np.inf))
+    else:
+        i = np.argmin(np.where(mascara, valores, np.inf))
+    return funcoes[i], valores[i]
+
+@st.cache_data(hash_funcs={pd.DataFrame: _chave_dataframe})
+def precalcular_respostas(df_evolucao, df_detentores, df_gastos):
+    """Monta, uma única vez, o texto de todas as respostas pré-definidas.
+
+    Os dados são fixos durante a sessão, então cada clique vira só uma
+    consulta a este dicionário {pergunta: (em_markdown, resposta)}, onde
+    `em_markdown` indica as listagens, que já vêm formatadas em Markdown.
+    """
+    gastos_por_ano = precalcular_gastos(df_gastos)
+    detentores = df_detentores.sort_values(by='porcentagem', ascending=False)
     
-    try:
+    anos = df_gastos['ano'].to_numpy()
+    valores = df_gastos['valor_bi'].to_numpy()
+    funcoes = df_gastos['funcao'].to_numpy()
+    funcao_max_2018, valor_max_2018 = _gasto_extremo(anos, valores, funcoes, 2018)
+    funcao_min_2018, valor_min_2018 = _gasto_extremo(anos, valores, funcoes, 2018, maior=False)
+    funcao_max_2024, valor_max_2024 = _gasto_extremo(anos, valores, funcoes, 2024)
+    credor = detentores.iloc[0]
+    # `nlargest`/`nsmallest` trazem ano (índice) e valor numa chamada só
+    maior_estoque = df_evolucao['valor_trilhoes'].nlargest(1)
+    menor_estoque = df_evolucao['valor_trilhoes'].nsmallest(1)
+    ano_max_idx, valor_max = maior_estoque.index[0], maior_estoque.iloc[0]
+    ano_min_idx, valor_min = menor_estoque.index[0], menor_estoque.iloc[0]
+    
+    linhas_2024 = _formatar_linhas(gastos_por_ano[2024], MODELO_LINHA_GASTO)
+    linhas_2018 = _formatar_linhas(gastos_por_ano[2018], MODELO_LINHA_GASTO)
+    linhas_credores = _formatar_linhas(
+        detentores[['credor', 'porcentagem']].to_dict('records'), MODELO_LINHA_CREDOR
+    )
+    
+    return {
         # --- PERGUNTAS DE LISTAGEM (NOVAS) ---
-        if pergunta == "Listar todos os gastos de 2024 (do maior para o menor)":
-            df_2024 = df_gastos[df_gastos['ano'] == 2024].copy()
-            total_2024 = df_2024['valor_bi'].sum()
-            df_2024['porcentagem'] = (df_2024['valor_bi'] / total_2024) * 100
-            df_2024 = df_2024.sort_values(by='porcentagem', ascending=False)
-            
-            resposta_md = "### Gastos de 2024 (do maior para o menor):\n\n"
-            for _, row in df_2024.iterrows():
-                resposta_md += f"- **{row['funcao']}**: R$ {row['valor_bi']:.1f} bi ({row['porcentagem']:.1f}% do total listado)\n"
-            return resposta_md
-
-        elif pergunta == "Listar todos os gastos de 2018 (do maior para o menor)":
-            df_2018 = df_gastos[df_gastos['ano'] == 2018].copy()
-            total_2018 = df_2018['valor_bi'].sum()
-            df_2018['porcentagem'] = (df_2018['valor_bi'] / total_2018) * 100
-            df_2018 = df_2018.sort_values(by='porcentagem', ascending=False)
-            
-            resposta_md = "### Gastos de 2018 (do maior para o menor):\n\n"
-            for _, row in df_2018.iterrows():
-                resposta_md += f"- **{row['funcao']}**: R$ {row['valor_bi']:.1f} bi ({row['porcentagem']:.1f}% do total listado)\n"
-            return resposta_md
-
-        elif pergunta == "Listar todos os credores da Dívida (do maior para o menor)":
-            df_sorted = df_detentores.sort_values(by='porcentagem', ascending=False)
-            resposta_md = "### Credores da Dívida (do maior para o menor):\n\n"
-            for _, row in df_sorted.iterrows():
-                resposta_md += f"- **{row['credor']}**: {row['porcentagem']:.1f}%\n"
-            return resposta_md
-
-        # --- PERGUNTAS DIRETAS (ATUALIZADAS E LIMPAS) ---
-        elif pergunta == "Qual foi o maior gasto em 2018?":
-            df_2018 = df_gastos[df_gastos['ano'] == 2018]
-            gasto_max_idx = df_2018['valor_bi'].idxmax()
-            gasto = df_2018.loc[gasto_max_idx]
-            return f"O maior gasto em 2018 foi com **{gasto['funcao']}**, no valor de **R$ {gasto['valor_bi']} Bilhões**."
-
-        elif pergunta == "Qual foi o menor gasto em 2018?":
-            df_2018 = df_gastos[df_gastos['ano'] == 2018]
-            gasto_min_idx = df_2018['valor_bi'].idxmin()
-            gasto = df_2018.loc[gasto_min_idx]
-            return f"O menor gasto em 2018 (entre os principais listados) foi com **{gasto['funcao']}**, no valor de **R$ {gasto['valor_bi']} Bilhões**."
-
-        elif pergunta == "Qual foi o maior gasto em 2024?":
-            df_2024 = df_gastos[df_gastos['ano'] == 2024]
-            gasto_max_idx = df_2024['valor_bi'].idxmax()
-            gasto = df_2024.loc[gasto_max_idx]
-            return f"O maior gasto em 2024 é com **{gasto['funcao']}**, no valor de **R$ {gasto['valor_bi']} Bilhões**."
+        "Listar todos os gastos de 2024 (do maior para o menor)":
+            (True, "### Gastos de 2024 (do maior para o menor):\n\n" + linhas_2024 + "\n"),
+        "Listar todos os gastos de 2018 (do maior para o menor)":
+            (True, "### Gastos de 2018 (do maior para o menor):\n\n" + linhas_2018 + "\n"),
+        "Listar todos os credores da Dívida (do maior para o menor)":
+            (True, "### Credores da Dívida (do maior para o menor):\n\n" + linhas_credores + "\n"),
         
-        elif pergunta == "Qual o principal credor da Dívida Pública?":
-            credor_max_idx = df_detentores['porcentagem'].idxmax()
-            credor = df_detentores.loc[credor_max_idx]
-            return f"O principal credor da Dívida Pública são os **{credor['credor']}**, detendo **{credor['porcentagem']}%** do total."
-
-        elif pergunta == "Qual foi o ano com o maior estoque da Dívida?":
-            ano_max_idx = df_evolucao['valor_trilhoes'].idxmax()
-            valor_max = df_evolucao.loc[ano_max_idx]['valor_trilhoes']
-            return f"O ano com o maior estoque da Dívida Pública no período foi **{ano_max_idx}**, atingindo **R$ {valor_max} Trilhões**."
+        # --- PERGUNTAS DIRETAS (ATUALIZADAS E LIMPAS) ---
+        "Qual foi o maior gasto em 2018?":
+            (False, f"O maior gasto em 2018 foi com **{funcao_max_2018}**, no valor de **R$ {valor_max_2018} Bilhões**."),
+        "Qual foi o menor gasto em 2018?":
+            (False, f"O menor gasto em 2018 (entre os principais listados) foi com **{funcao_min_2018}**, no valor de **R$ {valor_min_2018} Bilhões**."),
+        "Qual foi o maior gasto em 2024?":
+            (False, f"O maior gasto em 2024 é com **{funcao_max_2024}**, no valor de **R$ {valor_max_2024} Bilhões**."),
+        "Qual o principal credor da Dívida Pública?":
+            (False, f"O principal credor da Dívida Pública são os **{credor['credor']}**, detendo **{credor['porcentagem']}%** do total."),
+        "Qual foi o ano com o maior estoque da Dívida?":
+            (False, f"O ano com o maior estoque da Dívida Pública no período foi **{ano_max_idx}**, atingindo **R$ {valor_max} Trilhões**."),
+        "Qual foi o ano com o menor estoque da Dívida?":
+            (False, f"O ano com o menor estoque da Dívida Pública no período foi **{ano_min_idx}**, com **R$ {valor_min} Trilhões**."),
+    }
+
+# --- Componente Interativo (HTML + JavaScript) ---
+# Todas as respostas já estão pré-calculadas, então a aba 4 não precisa voltar
+# ao servidor: as respostas vão embutidas na página e o navegador só as exibe.
+
+# Cores dos temas claro e escuro do Streamlit (o iframe não herda o tema da página)
+PALETAS_TEMA = {
+    'light': {
+        'esquema': 'light', 'texto': 'rgb(49, 51, 63)', 'fundo': 'rgb(255, 255, 255)',
+        'fundo_menu': 'rgb(240, 242, 246)', 'borda': 'rgba(49, 51, 63, 0.2)',
+        'fundo_sucesso': 'rgba(33, 195, 84, 0.1)', 'texto_sucesso': 'rgb(23, 114, 51)',
+    },
+    'dark': {
+        'esquema': 'dark', 'texto': 'rgb(250, 250, 250)', 'fundo': 'rgb(14, 17, 23)',
+        'fundo_menu': 'rgb(38, 39, 48)', 'borda': 'rgba(250, 250, 250, 0.2)',
+        'fundo_sucesso': 'rgba(61, 213, 109, 0.2)', 'texto_sucesso': 'rgb(223, 253, 233)',
+    },
+}
+
+# Grupos do menu, conforme o tipo de resposta de `precalcular_respostas`
+GRUPOS_PERGUNTAS = {True: "Perguntas de Listagem", False: "Perguntas Diretas"}
+
+MODELO_COMPONENTE_PERGUNTAS = """
+<style>
+  :root {{ color-scheme: {esquema}; }}
+  body {{ font-family: "Source Sans Pro", sans-serif; margin: 0;
+          color: {texto}; background: {fundo}; }}
+  label {{ display: block; font-size: 0.9rem; margin-bottom: 0.4rem; }}
+  select {{ width: 100%; padding: 0.5rem; font-size: 1rem; border-radius: 0.5rem;
+            color: inherit; background: {fundo_menu}; border: 1px solid {borda}; }}
+  .sucesso {{ margin-top: 1rem; padding: 1rem; border-radius: 0.5rem;
+              background: {fundo_sucesso}; color: {texto_sucesso}; }}
+</style>
+<label for="pergunta">Escolha sua pergunta:</label>
+<select id="pergunta">
+  <option value="" selected disabled>Selecione uma pergunta...</option>
+  {opcoes}
+</select>
+<div id="resposta"></div>
+<script>
+  const RESPOSTAS = {respostas_json};
+  document.getElementById("pergunta").addEventListener("change", (evento) => {{
+    document.getElementById("resposta").innerHTML = RESPOSTAS[evento.target.value];
+  }});
+</script>
+"""
 
-        elif pergunta == "Qual foi o ano com o menor estoque da Dívida?":
-            ano_min_idx = df_evolucao['valor_trilhoes'].idxmin()
-            valor_min = df_evolucao.loc[ano_min_idx]['valor_trilhoes']
-            return f"O ano com o menor estoque da Dívida Pública no período foi **{ano_min_idx}**, com **R$ {valor_min} Trilhões**."
+def _markdown_para_html(texto):
+    """Converte o Markdown simples das respostas (###, listas e **negrito**) em HTML."""
+    texto = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(texto))
+    partes = []
+    em_lista = False
+    for linha in texto.splitlines():
+        item = linha.startswith("- ")
+        if item and not em_lista:
+            partes.append("<ul>")
+        elif em_lista and not item:
+            partes.append("</ul>")
+        em_lista = item
+        
+        if item:
+            partes.append(f"<li>{linha[2:]}</li>")
+        elif linha.startswith("### "):
+            partes.append(f"<h3>{linha[4:]}</h3>")
+        elif linha.strip():
+            partes.append(f"<p>{linha}</p>")
+    if em_lista:
+        partes.append("</ul>")
+    return "".join(partes)
+
+def _tema_atual():
+    """Retorna 'light' ou 'dark', conforme o tema ativo do Streamlit."""
+    # `st.context.theme` só existe nas versões mais novas; sem ele, tema claro
+    tema = getattr(st.context, 'theme', None) if hasattr(st, 'context') else None
+    return 'dark' if getattr(tema, 'type', None) == 'dark' else 'light'
+
+def montar_componente_perguntas(respostas, tema='light'):
+    """Monta o HTML (menu + script) com todas as respostas embutidas em JSON."""
+    # As opções saem do próprio dicionário de respostas, então nunca ficam sem resposta
+    opcoes = "".join(
+        f'<optgroup label="{html.escape(grupo)}">'
+        + "".join(
+            f'<option value="{html.escape(p)}">{html.escape(p)}</option>'
+            for p, (em_markdown, _) in respostas.items() if em_markdown == listagem
+        )
+        + "</optgroup>"
+        for listagem, grupo in GRUPOS_PERGUNTAS.items()
+    )
+    respostas_html = {}
+    for pergunta, (em_markdown, resposta) in respostas.items():
+        conteudo = _markdown_para_html(resposta)
+        # Respostas diretas aparecem na caixa verde, como o antigo `st.success`
+        respostas_html[pergunta] = conteudo if em_markdown else f'<div class="sucesso">{conteudo}</div>'
+    # "</" escapado para que nenhum texto consiga fechar a tag <script>
+    respostas_json = json.dumps(respostas_html).replace("</", "<\\/")
+    return MODELO_COMPONENTE_PERGUNTAS.format(
+        opcoes=opcoes, respostas_json=respostas_json, **PALETAS_TEMA[tema]
+    )
 
+def mostrar_perguntas(df_evolucao, df_detentores, df_gastos):
+    """Exibe o menu de perguntas da aba 4 (respondido no navegador, sem rerun)."""
+    try:
+        respostas = precalcular_respostas(df_evolucao, df_detentores, df_gastos)
     except Exception as e:
-        return f"Ocorreu um erro ao processar sua pergunta: {e}"
+        st.error(f"Ocorreu um erro ao processar as perguntas: {e}")
+        return
     
-    return "Selecione uma pergunta."
+    componente = montar_componente_perguntas(respostas, _tema_atual())
+    # Altura fixa: a resposta só aparece depois, então não dá para medir o conteúdo
+    if hasattr(st, 'iframe'):
+        st.iframe(componente, height=360, alt="Perguntas sobre a Dívida e os Gastos Públicos")
+    else:
+        # Versões antigas do Streamlit (antes de `st.iframe`)
+        components.html(componente, height=360, scrolling=True)
+
+def mostrar_grafico(grafico):
+    """Exibe um gráfico Altair ocupando toda a largura da página."""
+    if 'width' in inspect.signature(st.altair_chart).parameters:
+        st.altair_chart(grafico, width='stretch')
+    else:
+        # Versões antigas do Streamlit (antes de `width='stretch'`)
+        st.altair_chart(grafico, use_container_width=True)
 
 
 # --- Interface Principal do Streamlit ---
@@ -211,98 +357,76 @@ st.markdown("""
 Este aplicativo apresenta uma análise interativa dos dados orçamentários do Brasil, 
 inspirado no artigo de João Nogueira Thieme sobre desigualdade e endividamento público.
 
-**Nota:** Os dados são carregados de arquivos `.json` locais, que contêm "snapshots" (fotos) 
+**Nota:** Os dados vêm de arquivos `.json` locais (embutidos no app), que contêm "snapshots" (fotos) 
 de dados reais e condensados dos portais oficiais (Tesouro Nacional, Siga Brasil). 
 Esta abordagem garante 100% de estabilidade para a apresentação.
 """)
 
 # Carregar os dados
-df_evolucao, df_detentores, df_gastos = carregar_dataframes()
-
-if df_evolucao is not None and df_detentores is not None and df_gastos is not None:
+df_evolucao, df_detentores, df_gastos, df_gastos_pivot = carregar_dataframes()
+
+# O cache devolve cópias novas a cada rerun, então as chaves são refeitas aqui
+CHAVES_DATAFRAMES = {
+    id(df_evolucao): 'evolucao',
+    id(df_detentores): 'detentores',
+    id(df_gastos): 'gastos',
+    id(df_gastos_pivot): 'gastos_pivot',
+}
+
+# Criar abas para cada gráfico/funcionalidade
+tab1, tab2, tab3, tab4 = st.tabs([
+    "📈 Gráfico 1: Evolução da Dívida",
+    "📊 Gráfico 2: Comparativo de Gastos",
+    " पाई Gráfico 3: Credores da Dívida",
+    "💡 Insights Interativos"
+])
+
+with tab1:
+    st.header("Gráfico 1: A Trajetória da Dívida Pública (2018-2024)")
+    st.markdown("""
+    Este gráfico mostra o crescimento do estoque total da Dívida Pública Federal (DPF)
+    ao longo dos últimos anos. Este é o dado macro que fundamenta a discussão sobre 
+    o endividamento crescente.
+    """)
+    grafico_evolucao = criar_grafico_evolucao(df_evolucao)
+    mostrar_grafico(grafico_evolucao)
+    st.dataframe(df_evolucao, use_container_width=True)
+
+with tab2:
+    st.header("Gráfico 2: Comparativo dos Principais Gastos (2018 vs 2024)")
+    st.markdown("""
+    Aqui, comparamos as principais funções de despesa do Orçamento Federal entre 
+    2018 e 2024 (dados condensados). Note o crescimento expressivo nos gastos
+    com a Dívida e Encargos Especiais.
+    """)
+    grafico_gastos = criar_grafico_gastos_comparativo(df_gastos_pivot)
+    mostrar_grafico(grafico_gastos)
+    st.dataframe(df_gastos_pivot, use_container_width=True)
+
+with tab3:
+    st.header("Gráfico 3: Quem são os Credores da Dívida?")
+    st.markdown("""
+    Este gráfico (baseado no "snapshot" mais recente do Tesouro Nacional) mostra 
+    quem detém os títulos da dívida pública. Como o artigo aponta, a maior parte 
+    está concentrada em Fundos de Previdência, Fundos de Investimento e Bancos.
+    """)
+    grafico_detentores = criar_grafico_detentores(df_detentores)
+    mostrar_grafico(grafico_detentores)
     
-    # Criar abas para cada gráfico/funcionalidade
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📈 Gráfico 1: Evolução da Dívida",
-        "📊 Gráfico 2: Comparativo de Gastos",
-        " पाई Gráfico 3: Credores da Dívida",
-        "💡 Insights Interativos"
-    ])
-
-    with tab1:
-        st.header("Gráfico 1: A Trajetória da Dívida Pública (2018-2024)")
-        st.markdown("""
-        Este gráfico mostra o crescimento do estoque total da Dívida Pública Federal (DPF)
-        ao longo dos últimos anos. Este é o dado macro que fundamenta a discussão sobre 
-        o endividamento crescente.
-        """)
-        fig_evolucao = criar_grafico_evolucao(df_evolucao)
-        st.pyplot(fig_evolucao)
-        st.dataframe(df_evolucao, use_container_width=True)
-
-    with tab2:
-        st.header("Gráfico 2: Comparativo dos Principais Gastos (2018 vs 2024)")
-        st.markdown("""
-        Aqui, comparamos as principais funções de despesa do Orçamento Federal entre 
-        2018 e 2024 (dados condensados). Note o crescimento expressivo nos gastos
-        com a Dívida e Encargos Especiais.
-        """)
-        fig_gastos = criar_grafico_gastos_comparativo(df_gastos)
-        st.pyplot(fig_gastos)
-        st.dataframe(df_gastos.pivot(index='funcao', columns='ano', values='valor_bi'), use_container_width=True)
-
-    with tab3:
-        st.header("Gráfico 3: Quem são os Credores da Dívida?")
-        st.markdown("""
-        Este gráfico (baseado no "snapshot" mais recente do Tesouro Nacional) mostra 
-        quem detém os títulos da dívida pública. Como o artigo aponta, a maior parte 
-        está concentrada em Fundos de Previdência, Fundos de Investimento e Bancos.
-        """)
-        fig_detentores = criar_grafico_detentores(df_detentores)
-        st.pyplot(fig_detentores)
-        
-        with st.expander("Ver descrições dos credores e dados em tabela"):
-            st.dataframe(df_detentores, use_container_width=True)
-
-    # Nova Aba Interativa!
-    with tab4:
-        st.header("💡 Insights Interativos")
-        st.markdown("""
-        Selecione uma pergunta pré-definida e o aplicativo irá consultar 
-        o "dataset" (nossos arquivos `.json` locais) para encontrar a resposta.
-        """)
-        
-        # Lista de perguntas ATUALIZADA
-        lista_perguntas = [
-            "Selecione uma pergunta...",
-            "--- Perguntas de Listagem ---",
-            "Listar todos os gastos de 2024 (do maior para o menor)",
-            "Listar todos os gastos de 2018 (do maior para o menor)",
-            "Listar todos os credores da Dívida (do maior para o menor)",
-            "--- Perguntas Diretas ---",
-            "Qual foi o maior gasto em 2018?",
-            "Qual foi o menor gasto em 2018?",
-            "Qual foi o maior gasto em 2024?",
-            "Qual o principal credor da Dívida Pública?",
-            "Qual foi o ano com o maior estoque da Dívida?",
-            "Qual foi o ano com o menor estoque da Dívida?"
-        ]
-        
-        pergunta_selecionada = st.selectbox("Escolha sua pergunta:", lista_perguntas)
-        
-        if st.button("Buscar Resposta", type="primary"):
-            if "..." in pergunta_selecionada:
-                st.warning("Por favor, selecione uma pergunta válida.")
-            else:
-                resposta = responder_pergunta(pergunta_selecionada, df_evolucao, df_detentores, df_gastos)
-                # Respostas de listagem já vêm formatadas em Markdown
-                if "###" in resposta:
-                    st.markdown(resposta)
-                else:
-                    st.success(resposta)
-
-else:
-    st.error("Falha ao carregar os arquivos de dados JSON. Verifique se os arquivos `dados_evolucao_divida.json`, `dados_detentores_divida.json`, e `dados_gastos_comparativo.json` estão na mesma pasta que o aplicativo.")
+    with st.expander("Ver descrições dos credores e dados em tabela"):
+        st.dataframe(df_detentores, use_container_width=True)
+
+# Nova Aba Interativa!
+with tab4:
+    st.header("💡 Insights Interativos")
+    st.markdown("""
+    Selecione uma pergunta pré-definida e o aplicativo irá consultar 
+    o "dataset" (nossos arquivos locais) para encontrar a resposta.
+    """)
+    
+    # As respostas aparecem direto no navegador, sem rodar o script de novo
+    mostrar_perguntas(df_evolucao, df_detentores, df_gastos)
+
 
 st.sidebar.title("Sobre o Projeto")
 st.sidebar.info("""
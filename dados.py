@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshots (fotos) dos dados da Dívida Pública e dos Gastos Federais.
+
+ARQUIVO GERADO por `gerar_snapshot.py` a partir dos arquivos `.json`.
+Não edite à mão: altere os `.json` e rode o script novamente.
+"""
+
+import pandas as pd
+
+
+EVOLUCAO = pd.DataFrame({
+    'ano': [2018, 2019, 2020, 2021, 2022, 2023, 2024],
+    'valor_trilhoes': [3.75, 4.25, 5.01, 5.61, 5.95, 6.52, 7.32],
+}).set_index('ano')
+
+DETENTORES = pd.DataFrame({
+    'credor': ['Fundos de Previdência', 'Fundos de Investimento', 'Instituições Financeiras', 'Não-Residentes (Estrangeiros)', 'Outros', 'Governo', 'Seguradoras'],
+    'porcentagem': [25.5, 24.8, 20.2, 11.0, 10.7, 4.0, 3.8],
+    'descricao': ['Entidades de previdência privada (aberta e fechada) e regimes próprios (RPPS).', 'Fundos de renda fixa, multimercado, etc., que compram títulos para seus cotistas.', 'Carteira própria de bancos comerciais nacionais e estrangeiros.', 'Investidores e governos estrangeiros que compram títulos da dívida brasileira.', 'Inclui Pessoas Físicas (Tesouro Direto) e outras entidades.', 'Fundos administrados pelo setor público.', 'Reservas técnicas de companhias de seguro.'],
+})
+
+GASTOS = pd.DataFrame({
+    'ano': [2018, 2018, 2018, 2018, 2018, 2018, 2024, 2024, 2024, 2024, 2024, 2024],
+    'funcao': ['Dívida/Encargos', 'Previdência', 'Transferências', 'Saúde', 'Educação', 'Assistência', 'Dívida/Encargos', 'Previdência', 'Transferências', 'Saúde', 'Educação', 'Assistência'],
+    'valor_bi': [1055.0, 585.0, 300.0, 121.0, 100.0, 90.0, 2600.0, 918.0, 488.0, 202.0, 160.0, 267.0],
+})
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Gera o módulo `dados.py`, com os snapshots usados pelo aplicativo embutidos
+como literais Python, a partir dos arquivos JSON.
+
+Os arquivos `.json` continuam sendo a fonte editável dos dados. Sempre que um
+deles for alterado, rode este script uma vez para atualizar o `dados.py`:
+
+    python gerar_snapshot.py
+"""
+
+import json
+
+# Arquivo JSON de origem -> (nome da constante em dados.py, coluna de índice)
+SNAPSHOTS = {
+    'dados_evolucao_divida.json': ('EVOLUCAO', 'ano'),
+    'dados_detentores_divida.json': ('DETENTORES', None),
+    'dados_gastos_comparativo.json': ('GASTOS', None),
+}
+
+ARQUIVO_SAIDA = 'dados.py'
+
+CABECALHO = '''# -*- coding: utf-8 -*-
+"""
+Snapshots (fotos) dos dados da Dívida Pública e dos Gastos Federais.
+
+ARQUIVO GERADO por `gerar_snapshot.py` a partir dos arquivos `.json`.
+Não edite à mão: altere os `.json` e rode o script novamente.
+"""
+
+import pandas as pd
+'''
+
+
+def ler_json(caminho_arquivo):
+    """Lê um arquivo JSON local e retorna os dados."""
+    with open(caminho_arquivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def gerar_constante(nome, registros, indice):
+    """Escreve um `pd.DataFrame({...})` literal (uma lista por coluna)."""
+    colunas = list(registros[0])
+    linhas = [f"{nome} = pd.DataFrame({{"]
+    for coluna in colunas:
+        valores = [registro[coluna] for registro in registros]
+        linhas.append(f"    {coluna!r}: {valores!r},")
+    linhas.append(f"}}).set_index({indice!r})" if indice else "})")
+    return "\n".join(linhas)
+
+
+def main():
+    blocos = [CABECALHO]
+    for origem, (nome, indice) in SNAPSHOTS.items():
+        registros = ler_json(origem)
+        blocos.append(gerar_constante(nome, registros, indice))
+        print(f"{origem} -> {ARQUIVO_SAIDA}:{nome} ({len(registros)} linhas)")
+
+    # Mesmo fim de linha (CRLF) do restante do código do app
+    with open(ARQUIVO_SAIDA, 'w', encoding='utf-8', newline='\r\n') as f:
+        f.write("\n\n".join(blocos) + "\n")
+
+
+if __name__ == '__main__':
+    main()